@@ -4,30 +4,48 @@ import json
 import os
 import re
 import sys
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, List
 
-from . import db
+from . import ai_cache, db
 from .models import Event
 from .utils import parse_date_time, now_utc
 
 # Lazy import supporting both new (>=1.0) and legacy (<1.0) openai packages.
+# Populated by _load_openai() on first use: openai pulls in httpx/pydantic,
+# which `cal-ai --config` / `--help` never need.
+OpenAI = None  # type: ignore
+AsyncOpenAI = None  # type: ignore
+BadRequestError = None  # type: ignore
+openai_legacy = None  # type: ignore
+_openai_loaded = False
+
+# Response-path JSON goes through orjson when installed (optional); config
+# files and batch request lines stay on stdlib json.
 try:
-    from openai import OpenAI  # new client class
-except ImportError:
-    OpenAI = None  # type: ignore
-try:
-    import openai as openai_legacy  # legacy module (has ChatCompletion)
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
 except ImportError:
-    openai_legacy = None  # type: ignore
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
 
 CONFIG_DIR = Path.home() / ".config" / "cal-ai"
 CONFIG_PATH = CONFIG_DIR / "config.json"
 MAX_TITLE_LEN = 120
 RETRY_LIMIT = 3
 MAX_MODIFY_ROUNDS = 5  # limit iterative user modification cycles
+MAX_CONCURRENT_REQUESTS = 8  # in-flight chat calls for --lines
+BATCH_POLL_SEC = 30  # status polling interval for --batch
+JSON_MODE = {"type": "json_object"}  # response_format for constrained JSON output
 
 # NOTE: This string contains many literal JSON braces. Do NOT use str.format on it.
 # We will manually replace only the specific placeholder tokens.
@@ -128,10 +146,40 @@ User prompt: "Company offsite next Friday (all day) at Mountain Lodge"
 Return ONLY the JSON object.
 """
 
-JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+# Placeholder tokens in SYSTEM_PROMPT. The template is split once at import into
+# literal chunks and placeholder keys; filling it is then a single join.
+_PROMPT_RE = re.compile(r"\{(iso_now|today|now_time|tz_name|tz_offset)\}")
+_prompt_pieces = _PROMPT_RE.split(SYSTEM_PROMPT)
+_PROMPT_PARTS: List[str] = _prompt_pieces[0::2]
+_PROMPT_KEYS: List[str] = _prompt_pieces[1::2]
+del _prompt_pieces
+# Per-response validation patterns use RE2's DFA matcher when google-re2 is
+# installed (optional); stdlib re otherwise. Keep them RE2-compatible.
+try:
+    import re2 as _re_fast  # type: ignore[import-not-found]
+except ImportError:
+    _re_fast = re
+_TIME_RE = _re_fast.compile(r"\d{2}:\d{2}")
+_RRULE_RE = _re_fast.compile(r"[A-Z0-9=;,-]+")
+_YES = frozenset({"y", "yes"})
+_NO = frozenset({"n", "no"})
+# "no, make it 30 minutes" / "n later" -> instruction after the no/n prefix
+_DECLINE_WITH_TEXT_RE = re.compile(r"no?[\s,][\s,]*(.*)", re.IGNORECASE | re.DOTALL)
+# Times relative to "now" ("in 2 hours", "in 30 min", "tonight") resolve
+# differently on each run, so such prompts bypass the proposal cache.
+_RELATIVE_TIME_RE = re.compile(
+    r"\b(?:in\s+(?:an?|\d+|a\s+few|half\s+an)\s*(?:min|minute|hr|hour)s?|right\s+now|now|tonight|later\s+today)\b",
+    re.IGNORECASE,
+)
 
-@dataclass
+@dataclass(frozen=True)
 class AiEventProposal:
+    # Explicit __slots__ (no per-instance __dict__); equivalent to slots=True
+    # without requiring Python 3.10. Frozen also makes proposals hashable.
+    __slots__ = (
+        "title", "date", "time", "duration_minutes", "description",
+        "location", "all_day", "rrule", "notify",
+    )
     title: str
     date: str
     time: Optional[str]
@@ -143,26 +191,33 @@ class AiEventProposal:
     notify: Optional[str]  # new: custom notify schedule or None
 
 def load_config() -> Dict[str, Any]:
-    if not CONFIG_PATH.exists():
-        return {}
     try:
-        return json.loads(CONFIG_PATH.read_text())
+        with open(CONFIG_PATH, "r") as f:
+            return json.load(f)
     except Exception:
         return {}
 
 def save_config(cfg: Dict[str, Any]) -> None:
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-    CONFIG_PATH.write_text(json.dumps(cfg, indent=2))
-    os.chmod(CONFIG_PATH, 0o600)
+    # Create with 0600 up front (no world-readable window for the API key),
+    # then atomically swap into place so a crash never leaves a truncated config.
+    tmp_path = CONFIG_PATH.with_suffix(".tmp")
+    fd = os.open(str(tmp_path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(cfg, f, indent=2)
+    os.replace(tmp_path, CONFIG_PATH)
 
 def interactive_config() -> None:
     print("Configure cal-ai (OpenAI-compatible API)")
     base_url = input("API base URL (e.g. https://api.openai.com/v1/): ").strip()
     model = input("Model (e.g. gpt-4o-mini): ").strip()
     api_key = input("API key: ").strip()
+    embedding_model = input("Embedding model for semantic cache (e.g. text-embedding-3-small; blank to disable): ").strip()
     if not base_url.endswith("/"):
         base_url += "/"
     cfg = {"base_url": base_url, "model": model, "api_key": api_key}
+    if embedding_model:
+        cfg["embedding_model"] = embedding_model
     save_config(cfg)
     print(f"Saved config to {CONFIG_PATH}")
 
@@ -187,7 +242,22 @@ def read_prompt(args: argparse.Namespace) -> str:
         print("No prompt provided and no interactive input available.", file=sys.stderr)
         sys.exit(1)
 
+def _load_openai() -> None:
+    global OpenAI, AsyncOpenAI, BadRequestError, openai_legacy, _openai_loaded
+    if _openai_loaded:
+        return
+    _openai_loaded = True
+    try:
+        from openai import OpenAI, AsyncOpenAI, BadRequestError  # new client classes
+    except ImportError:
+        pass
+    try:
+        import openai as openai_legacy  # legacy module (has ChatCompletion)
+    except ImportError:
+        pass
+
 def build_client(cfg: Dict[str, Any]):
+    _load_openai()
     if OpenAI is None and openai_legacy is None:
         print("openai package not installed. pip install openai")
         sys.exit(1)
@@ -212,23 +282,118 @@ def build_client(cfg: Dict[str, Any]):
           "or downgrade to 0.28.x if you need legacy ChatCompletion.")
     sys.exit(1)
 
+def build_async_client(cfg: Dict[str, Any]):
+    """
+    Async counterpart of build_client for concurrent prompt processing.
+    Returns None when the installed openai package has no AsyncOpenAI
+    (callers fall back to sequential requests on the sync client).
+    """
+    if AsyncOpenAI is None:
+        return None
+    return AsyncOpenAI(base_url=cfg["base_url"], api_key=cfg["api_key"])
+
+class _JsonObjectScanner:
+    """
+    Brace-depth scanner for {...} spans; braces inside JSON strings (including
+    escaped quotes) are ignored. Text can be fed incrementally so a streamed
+    response can be cut off as soon as its object is complete.
+    """
+
+    def __init__(self, text: str = "", start: int = 0):
+        self.text = text
+        self.pos = start
+        self.begin = -1
+        self.depth = 0
+        self.in_str = False
+        self.esc = False
+
+    def scan(self) -> Optional[tuple[int, int]]:
+        """Return (begin, end) of the next balanced span, or None if not (yet) complete."""
+        text = self.text
+        i = self.pos
+        if self.begin == -1:
+            i = text.find("{", i)
+            if i == -1:
+                self.pos = len(text)
+                return None
+            self.begin = i
+            self.depth = 0
+            self.in_str = self.esc = False
+        for i in range(i, len(text)):
+            c = text[i]
+            if self.in_str:
+                if self.esc:
+                    self.esc = False
+                elif c == "\\":
+                    self.esc = True
+                elif c == '"':
+                    self.in_str = False
+            elif c == '"':
+                self.in_str = True
+            elif c == "{":
+                self.depth += 1
+            elif c == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    span = (self.begin, i + 1)
+                    self.begin = -1
+                    self.pos = i + 1
+                    return span
+        self.pos = len(text)
+        return None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        Append streamed text; return the first complete span that parses as a
+        JSON object. Spans that do not parse are retried from their next brace.
+        """
+        self.text += chunk
+        while True:
+            span = self.scan()
+            if span is None:
+                return None
+            candidate = self.text[span[0]:span[1]]
+            try:
+                if isinstance(_loads(candidate), dict):
+                    return candidate
+            except ValueError:
+                pass
+            self.pos = span[0] + 1
+
+def _find_json_object(s: str, start: int = 0) -> Optional[tuple[int, int]]:
+    """
+    Locate the first balanced {...} span at or after `start`.
+    Returns (begin, end) slice bounds or None if no balanced object exists.
+    """
+    return _JsonObjectScanner(s, start).scan()
+
 def extract_json(text: str) -> Optional[Dict[str, Any]]:
-    # Find first JSON object. Strip code fences if present.
-    # Strategy: find first { ... } (greedy) and attempt JSON parse progressively.
-    candidates: List[str] = []
-    # JSON code fence pattern
-    fence = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", text, re.DOTALL | re.IGNORECASE)
-    if fence:
-        candidates.append(fence.group(1))
-    # Fallback: any object
-    m = JSON_OBJECT_RE.search(text)
-    if m:
-        candidates.append(m.group(0))
-    for c in candidates:
+    # Fast path: well-behaved responses are a bare JSON object.
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
         try:
-            return json.loads(c)
-        except Exception:
-            continue
+            data = _loads(stripped)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return data
+    # Find first JSON object. Start at a code fence if present.
+    # Strategy: linear brace-depth scan; if a balanced span does not parse
+    # (e.g. braces in leading prose), retry from the next opening brace.
+    fence = text.find("```")
+    for pos in ((fence, 0) if fence > 0 else (0,)):
+        while True:
+            span = _find_json_object(text, pos)
+            if span is None:
+                break
+            begin, end = span
+            try:
+                data = _loads(text[begin:end])
+            except Exception:
+                data = None
+            if isinstance(data, dict):
+                return data
+            pos = begin + 1
     return None
 
 def validate_payload(raw: Dict[str, Any]) -> (Optional[AiEventProposal], List[str]):
@@ -236,7 +401,9 @@ def validate_payload(raw: Dict[str, Any]) -> (Optional[AiEventProposal], List[st
     def err(msg: str):
         errs.append(msg)
 
-    title = str(raw.get("title", "")).strip()
+    # JSON strings are already str; only coerce other types.
+    title_raw = raw.get("title")
+    title = title_raw.strip() if isinstance(title_raw, str) else str(title_raw or "").strip()
     if not title:
         err("title missing/empty")
     if len(title) > MAX_TITLE_LEN:
@@ -260,16 +427,17 @@ def validate_payload(raw: Dict[str, Any]) -> (Optional[AiEventProposal], List[st
         if not isinstance(time_val, str):
             err("time not string")
         else:
-            if not re.fullmatch(r"\d{2}:\d{2}", time_val):
+            if not _TIME_RE.fullmatch(time_val):
                 err(f"time invalid format: {time_val}")
             else:
-                h, m = map(int, time_val.split(":"))
+                h, m = int(time_val[:2]), int(time_val[3:])
                 if not (0 <= h <= 23 and 0 <= m <= 59):
                     err(f"time out of range: {time_val}")
 
     duration = raw.get("duration_minutes", 60)
     try:
-        duration = int(duration)
+        if type(duration) is not int:
+            duration = int(duration)
         if duration <= 0:
             err("duration_minutes must be > 0")
             duration = 60
@@ -279,15 +447,15 @@ def validate_payload(raw: Dict[str, Any]) -> (Optional[AiEventProposal], List[st
 
     description = raw.get("description")
     if description is not None:
-        description = str(description).strip()
+        description = description.strip() if isinstance(description, str) else str(description).strip()
     location = raw.get("location")
     if location is not None:
-        location = str(location).strip()
+        location = location.strip() if isinstance(location, str) else str(location).strip()
     rrule = raw.get("rrule")
     if rrule is not None:
-        rrule = str(rrule).strip()
+        rrule = rrule.strip() if isinstance(rrule, str) else str(rrule).strip()
         # Light sanity check
-        if not re.match(r"^[A-Z0-9=;,-]+$", rrule):
+        if not _RRULE_RE.fullmatch(rrule):
             err(f"rrule suspicious: {rrule}")
 
     notify_val = raw.get("notify", None)
@@ -388,19 +556,25 @@ def accept_or_modify(prompt: str) -> (str, Optional[str]):
             return ("abort", None)
 
     lower = resp.lower()
-    if lower in ("y", "yes"):
+    if lower in _YES:
         return ("accept", None)
-    if lower in ("n", "no"):
+    if lower in _NO:
         return ("abort", None)
-    if lower.startswith("no ") or lower.startswith("no,") or lower.startswith("n ") or lower.startswith("n,"):
-        parts = resp.split(None, 1)
-        if len(parts) == 1:
-            return ("abort", None)
-        return ("modify", parts[1].lstrip(", ").strip() or None)
+    m = _DECLINE_WITH_TEXT_RE.match(resp)
+    if m:
+        return ("modify", m.group(1)) if m.group(1) else ("abort", None)
     if resp:
         return ("modify", resp)
     return ("abort", None)
 
+def _compact_conversation(conversation: List[Dict[str, str]], data: Dict[str, Any]) -> None:
+    """
+    Reset the history to system prompt + original user prompt + latest assistant JSON.
+    Earlier rounds and corrective retry messages are not needed to edit the
+    current JSON, so each request stays constant-size instead of growing per round.
+    """
+    conversation[2:] = [{"role": "assistant", "content": _dumps(data)}]
+
 def modify_proposal(
     client,
     model: str,
@@ -421,8 +595,8 @@ def modify_proposal(
     conversation.append({"role": "user", "content": user_msg})
 
     for attempt in range(1, RETRY_LIMIT + 1):
-        raw_resp = chat_generate(client, model, conversation)
-        data = extract_json(raw_resp)
+        raw_resp = chat_generate(client, model, conversation, json_mode=True)
+        data = parse_response(raw_resp)
         if not data:
             conversation.append({
                 "role": "user",
@@ -436,39 +610,95 @@ def modify_proposal(
                 "content": "Validation errors: " + "; ".join(errs) + " . Return corrected JSON ONLY."
             })
             continue
-        # Append assistant JSON to conversation for potential further modifications
-        conversation.append({"role": "assistant", "content": json.dumps(data, indent=2)})
+        # Keep only the latest assistant JSON for potential further modifications
+        _compact_conversation(conversation, data)
         return prop
     return None
 
 def format_preview(p: AiEventProposal) -> str:
-    lines = [
+    desc = p.description
+    if desc and len(desc) > 200:
+        desc = desc[:200] + "..."
+    # Optional lines collapse to None and are dropped by filter().
+    return "\n".join(filter(None, (
         f"Title: {p.title}",
         f"Date:  {p.date}",
         f"Time:  {(p.time or '(all-day)')}",
         f"Duration: {p.duration_minutes} min",
-    ]
-    if p.location:
-        lines.append(f"Location: {p.location}")
-    if p.description:
-        lines.append(f"Description: {p.description[:200] + ('...' if len(p.description) > 200 else '')}")
-    if p.rrule:
-        lines.append(f"RRULE: {p.rrule}")
-    if p.notify:
-        lines.append(f"Notify schedule: {p.notify}")
-    else:
-        lines.append("Notify schedule: (default)")
-    return "\n".join(lines)
+        p.location and f"Location: {p.location}",
+        desc and f"Description: {desc}",
+        p.rrule and f"RRULE: {p.rrule}",
+        f"Notify schedule: {p.notify or '(default)'}",
+    )))
+
+# Flipped off for the rest of the process if the backend rejects response_format
+# or stream=True respectively (OpenAI-compatible servers vary).
+_json_mode_supported = True
+_streaming_supported = True
+
+def _request_options(json_mode: bool) -> Dict[str, Any]:
+    opts: Dict[str, Any] = {}
+    if json_mode and _json_mode_supported:
+        opts["response_format"] = JSON_MODE
+    if _streaming_supported:
+        opts["stream"] = True
+    return opts
+
+def _downgrade_options(opts: Dict[str, Any], exc: Exception) -> Optional[Dict[str, Any]]:
+    """
+    Options to retry with after a BadRequestError (None = re-raise): drop
+    response_format first, then streaming. A request that carried an option
+    is retried without it even if a concurrent one (--lines) already
+    switched the option off.
+    """
+    global _json_mode_supported, _streaming_supported
+    if BadRequestError is None or not isinstance(exc, BadRequestError):
+        return None
+    if "response_format" in opts:
+        _json_mode_supported = False
+        return {k: v for k, v in opts.items() if k != "response_format"}
+    if "stream" in opts:
+        _streaming_supported = False
+        return {k: v for k, v in opts.items() if k != "stream"}
+    return None
+
+def _feed_chunk(scanner: _JsonObjectScanner, chunk) -> Optional[str]:
+    # One streamed delta; returns the JSON text once a complete object has arrived.
+    piece = chunk.choices[0].delta.content if chunk.choices else None
+    return scanner.feed(piece) if piece else None
+
+def _message_text(resp) -> str:
+    return resp.choices[0].message.content or ""
 
-def chat_generate(client, model: str, conversation: List[Dict[str, str]]) -> str:
+def chat_generate(client, model: str, conversation: List[Dict[str, str]], json_mode: bool = False) -> str:
     # New style (>=1.0)
     if hasattr(client, "chat") and hasattr(client.chat, "completions"):
-        resp = client.chat.completions.create(
-            model=model,
-            messages=conversation,
-            temperature=0.2,
-        )
-        return resp.choices[0].message.content or ""
+        opts = _request_options(json_mode)
+        while True:
+            try:
+                resp = client.chat.completions.create(
+                    model=model,
+                    messages=conversation,
+                    temperature=0.2,
+                    **opts,
+                )
+                break
+            except Exception as e:
+                opts = _downgrade_options(opts, e)
+                if opts is None:
+                    raise
+        if not opts.get("stream"):
+            return _message_text(resp)
+        # Stop reading as soon as a complete JSON object has arrived.
+        scanner = _JsonObjectScanner()
+        try:
+            for chunk in resp:
+                obj = _feed_chunk(scanner, chunk)
+                if obj is not None:
+                    return obj
+        finally:
+            resp.close()
+        return scanner.text
     # Legacy style
     if hasattr(client, "ChatCompletion"):
         resp = client.ChatCompletion.create(  # type: ignore
@@ -479,58 +709,280 @@ def chat_generate(client, model: str, conversation: List[Dict[str, str]]) -> str
         return resp["choices"][0]["message"]["content"]  # type: ignore
     raise RuntimeError("No supported chat API found on client. Reinstall/upgrade openai package.")
 
-def run_ai(args: argparse.Namespace) -> None:
-    cfg = load_config()
-    client = build_client(cfg)
-    model = cfg["model"]
-    user_prompt = read_prompt(args)
-    # New timezone/context additions
-    now_local = datetime.now().astimezone()
-    today_str = now_local.strftime("%Y-%m-%d")
-    now_time_str = now_local.strftime("%H:%M")
-    offset_raw = now_local.strftime("%z")  # e.g. +0200
-    tz_offset = offset_raw[:3] + ":" + offset_raw[3:]
-    tz_name = now_local.tzname() or "Local"
+async def achat_generate(client, model: str, conversation: List[Dict[str, str]], json_mode: bool = False) -> str:
+    opts = _request_options(json_mode)
+    while True:
+        try:
+            resp = await client.chat.completions.create(
+                model=model,
+                messages=conversation,
+                temperature=0.2,
+                **opts,
+            )
+            break
+        except Exception as e:
+            opts = _downgrade_options(opts, e)
+            if opts is None:
+                raise
+    if not opts.get("stream"):
+        return _message_text(resp)
+    scanner = _JsonObjectScanner()
+    try:
+        async for chunk in resp:
+            obj = _feed_chunk(scanner, chunk)
+            if obj is not None:
+                return obj
+    finally:
+        await resp.close()
+    return scanner.text
+
+def parse_response(raw_resp: str) -> Optional[Dict[str, Any]]:
+    # JSON mode responses parse directly; extract_json covers backends that ignore it.
+    try:
+        data = _loads(raw_resp)
+    except ValueError:
+        return extract_json(raw_resp)
+    return data if isinstance(data, dict) else extract_json(raw_resp)
+
+def _compute_offset(now_local: datetime) -> str:
+    # e.g. +02:00, from utcoffset() directly rather than strftime("%z")
+    minutes = int(now_local.utcoffset().total_seconds() // 60)  # type: ignore[union-attr]
+    sign = "-" if minutes < 0 else "+"
+    h, m = divmod(abs(minutes), 60)
+    return f"{sign}{h:02d}:{m:02d}"
+
+# Timezone context is fixed for the process lifetime (CLI invocations are short-lived).
+_NOW_AT_IMPORT = datetime.now().astimezone()
+_TZ_NAME = _NOW_AT_IMPORT.tzname() or "Local"
+_TZ_OFFSET = _compute_offset(_NOW_AT_IMPORT)
+
+def build_system_prompt() -> str:
+    now = datetime.now()
+    today_str = f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+    now_time_str = f"{now.hour:02d}:{now.minute:02d}"
     # Replaced str.format (which broke due to literal braces) with manual safe replacements.
     replacements = {
         "today": today_str,
         "now_time": now_time_str,
-        "tz_name": tz_name,
-        "tz_offset": tz_offset,
-        "iso_now": now_local.isoformat(timespec="minutes"),
+        "tz_name": _TZ_NAME,
+        "tz_offset": _TZ_OFFSET,
+        "iso_now": f"{today_str}T{now_time_str}{_TZ_OFFSET}",
     }
-    system_prompt_filled = SYSTEM_PROMPT
-    for k, v in replacements.items():
-        system_prompt_filled = system_prompt_filled.replace(f"{{{k}}}", v)
+    return "".join([p + replacements[k] for p, k in zip(_PROMPT_PARTS, _PROMPT_KEYS)]) + _PROMPT_PARTS[-1]
+
+def _absorb_response(
+    conversation: List[Dict[str, str]], raw_resp: str
+) -> (Optional[AiEventProposal], Optional[Dict[str, Any]]):
+    """
+    Parse/validate one model response for the initial proposal.
+    On failure, append corrective feedback to `conversation` and return (None, None).
+    """
+    data = parse_response(raw_resp)
+    if not data:
+        conversation.append({"role": "user", "content": "Could not find JSON object. Respond ONLY with JSON per spec."})
+        return None, None
+    prop, errs = validate_payload(data)
+    if errs:
+        conversation.append({
+            "role": "user",
+            "content": "Validation errors: " + "; ".join(errs) + " . Please return corrected JSON ONLY."
+        })
+        return None, None
+    # Record assistant JSON for future modification context
+    _compact_conversation(conversation, data)
+    return prop, data
+
+def _proposal_from_cache(
+    data: Optional[Dict[str, Any]], system_prompt: str, user_prompt: str
+) -> Optional[tuple[AiEventProposal, Dict[str, Any], List[Dict[str, str]]]]:
+    """Rebuild a proposal (and its modification context) from a cached JSON, if any."""
+    if not data:
+        return None
+    prop, errs = validate_payload(data)
+    if errs or not prop:
+        return None
+    conversation: List[Dict[str, str]] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+        {"role": "assistant", "content": _dumps(data)},
+    ]
+    return prop, data, conversation
+
+def embed_prompt(client, embedding_model: str, user_prompt: str) -> Optional[List[float]]:
+    # Semantic cache is best-effort: any embedding failure just means a cache miss.
+    try:
+        resp = client.embeddings.create(model=embedding_model, input=user_prompt)
+        return list(resp.data[0].embedding)
+    except Exception:
+        return None
+
+async def aembed_prompt(client, embedding_model: str, user_prompt: str) -> Optional[List[float]]:
+    try:
+        resp = await client.embeddings.create(model=embedding_model, input=user_prompt)
+        return list(resp.data[0].embedding)
+    except Exception:
+        return None
+
+def _cached_proposal(
+    model: str, system_prompt: str, user_prompt: str, vec: Optional[List[float]] = None
+) -> Optional[tuple[AiEventProposal, Dict[str, Any], List[Dict[str, str]]]]:
+    """
+    Exact-prompt cache hit, or with `vec` the nearest-embedding hit
+    (same model + day and same date/time signature).
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    if vec is None:
+        data = ai_cache.get(ai_cache.cache_key(model, today, user_prompt))
+    else:
+        data = ai_cache.nearest(ai_cache.scope_key(model, today), ai_cache.signature(user_prompt), vec)
+    return _proposal_from_cache(data, system_prompt, user_prompt)
+
+def _remember(model: str, user_prompt: str, data: Dict[str, Any], vec: Optional[List[float]]) -> None:
+    """Store an accepted proposal (and its prompt embedding, if any) in the cache."""
+    today = datetime.now().strftime("%Y-%m-%d")
+    key = ai_cache.cache_key(model, today, user_prompt)
+    ai_cache.put(key, data)
+    if vec:
+        ai_cache.put_vector(key, ai_cache.scope_key(model, today), ai_cache.signature(user_prompt), vec)
+
+def _forget(model: str, user_prompt: str) -> None:
+    """Drop a rejected prompt's cache entry so the next run asks the model again."""
+    ai_cache.delete(ai_cache.cache_key(model, datetime.now().strftime("%Y-%m-%d"), user_prompt))
+
+def use_cache_for(args: argparse.Namespace, user_prompt: str) -> bool:
+    """Proposal cache applies unless --no-cache, or the prompt is relative to now."""
+    return not getattr(args, "no_cache", False) and not _RELATIVE_TIME_RE.search(user_prompt)
+
+def request_proposal(
+    client,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    embedding_model: Optional[str] = None,
+    use_cache: bool = True,
+) -> (Optional[AiEventProposal], Optional[Dict[str, Any]], List[Dict[str, str]], Optional[List[float]]):
+    """
+    Obtain a validated initial proposal, consulting the proposal cache first
+    (if `use_cache`): exact prompt match, then (if `embedding_model` is set)
+    nearest embedding. Also returns the prompt embedding (or None) so
+    confirm_and_add can cache the proposal once the user accepts it.
+    """
+    vec = None
+    if use_cache:
+        hit = _cached_proposal(model, system_prompt, user_prompt)
+        if hit:
+            return (*hit, None)
+        vec = embed_prompt(client, embedding_model, user_prompt) if embedding_model else None
+        if vec:
+            hit = _cached_proposal(model, system_prompt, user_prompt, vec)
+            if hit:
+                return (*hit, vec)
     conversation: List[Dict[str, str]] = [
-        {"role": "system", "content": system_prompt_filled},
+        {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
+    for attempt in range(1, RETRY_LIMIT + 1):
+        prop, data = _absorb_response(conversation, chat_generate(client, model, conversation, json_mode=True))
+        if prop:
+            return prop, data, conversation, vec
+    return None, None, conversation, vec
 
-    proposal: Optional[AiEventProposal] = None
-    raw_json_obj: Optional[Dict[str, Any]] = None
+async def arequest_proposal(
+    client,
+    model: str,
+    system_prompt: str,
+    user_prompt: str,
+    embedding_model: Optional[str] = None,
+    use_cache: bool = True,
+) -> (Optional[AiEventProposal], Optional[Dict[str, Any]], List[Dict[str, str]], Optional[List[float]]):
+    vec = None
+    if use_cache:
+        hit = _cached_proposal(model, system_prompt, user_prompt)
+        if hit:
+            return (*hit, None)
+        vec = await aembed_prompt(client, embedding_model, user_prompt) if embedding_model else None
+        if vec:
+            hit = _cached_proposal(model, system_prompt, user_prompt, vec)
+            if hit:
+                return (*hit, vec)
+    conversation: List[Dict[str, str]] = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
     for attempt in range(1, RETRY_LIMIT + 1):
-        raw_resp = chat_generate(client, model, conversation)
-        data = extract_json(raw_resp)
-        if not data:
-            conversation.append({"role": "user", "content": "Could not find JSON object. Respond ONLY with JSON per spec."})
-            continue
-        prop, errs = validate_payload(data)
-        if errs:
-            conversation.append({
-                "role": "user",
-                "content": "Validation errors: " + "; ".join(errs) + " . Please return corrected JSON ONLY."
-            })
-            continue
-        proposal = prop
-        raw_json_obj = data
-        # Record assistant JSON for future modification context
-        conversation.append({"role": "assistant", "content": json.dumps(data, indent=2)})
-        break
+        prop, data = _absorb_response(conversation, await achat_generate(client, model, conversation, json_mode=True))
+        if prop:
+            return prop, data, conversation, vec
+    return None, None, conversation, vec
 
-    if not proposal or not raw_json_obj:
-        print("Failed to obtain valid event after retries.")
-        sys.exit(1)
+def _line_failed(user_prompt: str, exc: Exception):
+    # Per-line failure result for --lines: reported as such, other lines continue.
+    print(f"Request failed for {user_prompt!r}: {exc}", file=sys.stderr)
+    return None, None, [], None
+
+async def _request_proposals(cfg: Dict[str, Any], system_prompt: str, prompts: List[str], use_cache: List[bool]):
+    import asyncio  # only --lines needs it; keeps cal-ai --config/--help startup lean
+
+    client = build_async_client(cfg)
+    sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def one(user_prompt: str, cached: bool):
+        async with sem:
+            try:
+                return await arequest_proposal(
+                    client, cfg["model"], system_prompt, user_prompt, cfg.get("embedding_model") or None, cached
+                )
+            except Exception as e:
+                return _line_failed(user_prompt, e)
+
+    try:
+        return await asyncio.gather(*(one(p, c) for p, c in zip(prompts, use_cache)))
+    finally:
+        await client.close()
+
+def resolve_notify(args: argparse.Namespace, proposal: AiEventProposal) -> Optional[str]:
+    """Notify schedule from JSON or CLI flag (None = default/unspecified)."""
+    if proposal.notify:
+        return proposal.notify
+    if getattr(args, "notify", None) is not None:
+        try:
+            return db.normalize_notify_arg(args.notify)
+        except ValueError:
+            pass
+    return None
+
+def _needs_notify_row(applied: Optional[str]) -> bool:
+    # Only store if differs from default or is 'never'
+    return bool(applied) and (applied == "never" or applied != db.DEFAULT_NOTIFY)
+
+def apply_notify(args: argparse.Namespace, event_id: int, proposal: AiEventProposal) -> Optional[str]:
+    """Apply notify from JSON or CLI flag; returns the applied schedule (None = default)."""
+    applied = resolve_notify(args, proposal)
+    if _needs_notify_row(applied):
+        db.set_event_notify(event_id, applied)  # type: ignore[arg-type]
+    return applied
+
+def confirm_and_add(
+    args: argparse.Namespace,
+    client,
+    model: str,
+    conversation: List[Dict[str, str]],
+    proposal: AiEventProposal,
+    raw_json_obj: Dict[str, Any],
+    user_prompt: str,
+    vec: Optional[List[float]] = None,
+    use_cache: bool = True,
+) -> None:
+    """
+    Interactive accept/modify loop for one proposal, then insert it. Only the
+    accepted (possibly modified) JSON is cached for `user_prompt`; a rejected
+    proposal's cache entry is dropped.
+    """
+
+    def reject(msg: str) -> None:
+        print(msg)
+        if use_cache:
+            _forget(model, user_prompt)
 
     modify_round = 0
     while True:
@@ -539,49 +991,169 @@ def run_ai(args: argparse.Namespace) -> None:
         if action == "accept":
             break
         if action == "abort":
-            print("Aborted.")
+            reject("Aborted.")
             return
         # action == modify
         if modify_round >= MAX_MODIFY_ROUNDS:
-            print("Modification limit reached. Aborting.")
+            reject("Modification limit reached. Aborting.")
             return
         modify_round += 1
         if not instr:
-            print("No modification instruction provided; aborting.")
+            reject("No modification instruction provided; aborting.")
             return
         new_prop = modify_proposal(client, model, conversation, raw_json_obj, instr)
         if not new_prop:
-            print("Failed to apply modification; aborting.")
+            reject("Failed to apply modification; aborting.")
             return
         proposal = new_prop
         # Update raw_json_obj from last assistant JSON (conversation last message)
         try:
-            raw_json_obj = json.loads(conversation[-1]["content"])
+            raw_json_obj = _loads(conversation[-1]["content"])
         except Exception:
             pass
         continue  # loop to display updated preview
 
     ev = event_from_proposal(proposal)
     new_id = db.add_event(ev)
-    # Apply notify from JSON or CLI flag
-    applied = None
-    if proposal.notify:
-        if proposal.notify == "never" or proposal.notify != db.DEFAULT_NOTIFY:
-            db.set_event_notify(new_id, proposal.notify)
-        applied = proposal.notify
-    elif getattr(args, "notify", None) is not None:
-        try:
-            norm = db.normalize_notify_arg(args.notify)
-            if norm == "never" or norm != db.DEFAULT_NOTIFY:
-                db.set_event_notify(new_id, norm)
-            applied = norm
-        except ValueError:
-            pass
+    applied = apply_notify(args, new_id, proposal)
+    if use_cache:
+        _remember(model, user_prompt, raw_json_obj, vec)
     if applied:
         print(f"Added event #{new_id}: {proposal.title} (notify={applied})")
     else:
         print(f"Added event #{new_id}: {proposal.title}")
 
+def run_ai_lines(args: argparse.Namespace, cfg: Dict[str, Any], client) -> None:
+    """
+    One event per non-empty input line. Initial proposals are requested
+    concurrently (bounded by MAX_CONCURRENT_REQUESTS); confirmation stays sequential.
+    """
+    model = cfg["model"]
+    prompts = [line.strip() for line in read_prompt(args).splitlines() if line.strip()]
+    system_prompt = build_system_prompt()
+    use_cache = [use_cache_for(args, p) for p in prompts]
+    if AsyncOpenAI is not None and len(prompts) > 1:
+        import asyncio
+
+        results = asyncio.run(_request_proposals(cfg, system_prompt, prompts, use_cache))
+    else:
+        embedding_model = cfg.get("embedding_model") or None
+
+        def one(user_prompt: str, cached: bool):
+            try:
+                return request_proposal(client, model, system_prompt, user_prompt, embedding_model, cached)
+            except Exception as e:
+                return _line_failed(user_prompt, e)
+        results = [one(p, c) for p, c in zip(prompts, use_cache)]
+    for i, (user_prompt, cached, (proposal, raw_json_obj, conversation, vec)) in enumerate(
+        zip(prompts, use_cache, results), 1
+    ):
+        print(f"[{i}/{len(prompts)}] {user_prompt}")
+        if not proposal or not raw_json_obj:
+            print("Failed to obtain valid event after retries.")
+            continue
+        confirm_and_add(args, client, model, conversation, proposal, raw_json_obj, user_prompt, vec, cached)
+
+def _batch_request_lines(model: str, system_prompt: str, prompts: List[str]) -> bytes:
+    lines = []
+    for i, user_prompt in enumerate(prompts):
+        lines.append(json.dumps({
+            "custom_id": f"ev-{i}",
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                "temperature": 0.2,
+                "response_format": JSON_MODE,
+            },
+        }))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def run_ai_batch(args: argparse.Namespace, client, model: str) -> None:
+    """
+    Non-interactive bulk path: one event per non-empty input line, submitted
+    through the Batch API (/v1/batches). Valid proposals are added without
+    confirmation; invalid ones are reported and skipped (no retry round).
+    """
+    if not hasattr(client, "batches") or not hasattr(client, "files"):
+        print("--batch requires the openai>=1.0 client with Batch API support.")
+        sys.exit(1)
+    prompts = [line.strip() for line in read_prompt(args).splitlines() if line.strip()]
+    payload = _batch_request_lines(model, build_system_prompt(), prompts)
+    input_file = client.files.create(file=("cal-ai-batch.jsonl", payload), purpose="batch")
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} ({len(prompts)} prompt(s)); polling every {BATCH_POLL_SEC}s...")
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(BATCH_POLL_SEC)
+        batch = client.batches.retrieve(batch.id)
+    if batch.status != "completed" or not batch.output_file_id:
+        print(f"Batch {batch.id} ended with status {batch.status}.")
+        sys.exit(1)
+
+    contents: Dict[int, str] = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            obj = _loads(line)
+            idx = int(obj["custom_id"].split("-", 1)[1])
+            contents[idx] = obj["response"]["body"]["choices"][0]["message"]["content"] or ""
+        except Exception:
+            continue
+
+    proposals: List[AiEventProposal] = []
+    for i, user_prompt in enumerate(prompts):
+        raw_resp = contents.get(i)
+        data = parse_response(raw_resp) if raw_resp else None
+        if not data:
+            print(f"[{i + 1}/{len(prompts)}] No JSON returned; skipped: {user_prompt}")
+            continue
+        proposal, errs = validate_payload(data)
+        if errs or not proposal:
+            print(f"[{i + 1}/{len(prompts)}] Validation errors ({'; '.join(errs)}); skipped: {user_prompt}")
+            continue
+        proposals.append(proposal)
+
+    # Commit all events (and their notify prefs) at once rather than per event.
+    new_ids = db.add_events([event_from_proposal(p) for p in proposals])
+    applied_all = [resolve_notify(args, p) for p in proposals]
+    db.set_events_notify(
+        (new_id, applied) for new_id, applied in zip(new_ids, applied_all) if _needs_notify_row(applied)
+    )
+    for new_id, proposal, applied in zip(new_ids, proposals, applied_all):
+        if applied:
+            print(f"Added event #{new_id}: {proposal.title} (notify={applied})")
+        else:
+            print(f"Added event #{new_id}: {proposal.title}")
+
+def run_ai(args: argparse.Namespace) -> None:
+    cfg = load_config()
+    client = build_client(cfg)
+    model = cfg["model"]
+    if getattr(args, "batch", False):
+        run_ai_batch(args, client, model)
+        return
+    if getattr(args, "lines", False):
+        run_ai_lines(args, cfg, client)
+        return
+    user_prompt = read_prompt(args)
+    use_cache = use_cache_for(args, user_prompt)
+    proposal, raw_json_obj, conversation, vec = request_proposal(
+        client, model, build_system_prompt(), user_prompt, cfg.get("embedding_model") or None, use_cache
+    )
+    if not proposal or not raw_json_obj:
+        print("Failed to obtain valid event after retries.")
+        sys.exit(1)
+    confirm_and_add(args, client, model, conversation, proposal, raw_json_obj, user_prompt, vec, use_cache)
+
 def make_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="cal-ai", description="AI-powered calendar event creator")
     p.add_argument("--config", action="store_true", help="Configure API credentials")
@@ -593,6 +1165,24 @@ def make_parser() -> argparse.ArgumentParser:
         ),
         default=None,
     )
+    p.add_argument(
+        "--lines",
+        action="store_true",
+        help="Treat each non-empty input line as a separate event (requests run concurrently)",
+    )
+    p.add_argument(
+        "--batch",
+        action="store_true",
+        help=(
+            "Like --lines, but submit all prompts through the Batch API and add valid "
+            "events without confirmation (slower turnaround, lower cost)"
+        ),
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always ask the model; don't reuse or store accepted proposals",
+    )
     p.add_argument("prompt", nargs="*", help="Natural language prompt (optional if piping stdin)")
     return p
 
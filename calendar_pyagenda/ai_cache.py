@@ -0,0 +1,175 @@
+from __future__ import annotations
+import array
+import hashlib
+import json
+import math
+import operator
+import re
+import sqlite3
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from . import config
+from .utils import ensure_dirs
+
+# Cache of accepted AI proposals, kept apart from calendar.db so it can be
+# deleted freely. Exact prompt matches first; optionally nearest-neighbour
+# matches on prompt embeddings (semantic layer).
+CACHE_PATH = config.CACHE_DIR / "ai_cache.db"
+CACHE_TTL_SEC = 24 * 3600
+SEMANTIC_THRESHOLD = 0.92  # minimum cosine similarity for a semantic hit
+
+_conn: Optional[sqlite3.Connection] = None
+
+# Prompts that differ only in a time or day ("Dentist Friday 14:00" vs
+# "Dentist Friday 15:00") embed almost identically, so a semantic hit also
+# requires the same date/time signature.
+_SIG_TOKEN_RE = re.compile(r"(\d+)(?::(\d{2}))?\s*([ap]\.?m\.?)?|[a-z]+", re.IGNORECASE)
+_SIG_NUMBER_WORDS = {
+    w: i for i, w in enumerate(
+        "zero one two three four five six seven eight nine ten eleven twelve".split()
+    )
+}
+_SIG_WORDS = frozenset(
+    "today tomorrow tonight yesterday noon midnight morning afternoon evening next last "
+    "monday tuesday wednesday thursday friday saturday sunday "
+    "mon tue tues wed thu thur thurs fri sat sun "
+    "january february march april may june july august september october november december "
+    "jan feb mar apr jun jul aug sep sept oct nov dec".split()
+)
+
+def _connect() -> sqlite3.Connection:
+    ensure_dirs()
+    conn = sqlite3.connect(str(CACHE_PATH))
+    conn.row_factory = sqlite3.Row
+    with conn:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS proposals ("
+            "key TEXT PRIMARY KEY, json TEXT NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        cols = {r["name"] for r in conn.execute("PRAGMA table_info(vectors)")}
+        if cols and "sig" not in cols:
+            conn.execute("DROP TABLE vectors")  # pre-signature layout; cache is disposable
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            "key TEXT PRIMARY KEY, scope TEXT NOT NULL, sig TEXT NOT NULL, vec BLOB NOT NULL, "
+            "norm REAL NOT NULL, created_at INTEGER NOT NULL)"
+        )
+        conn.execute("DROP INDEX IF EXISTS idx_vectors_scope")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_vectors_scope_sig ON vectors(scope, sig)")
+        # Purge expired rows once per process
+        cutoff = int(time.time()) - CACHE_TTL_SEC
+        conn.execute("DELETE FROM proposals WHERE created_at < ?", (cutoff,))
+        conn.execute("DELETE FROM vectors WHERE created_at < ?", (cutoff,))
+    return conn
+
+def conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = _connect()
+    return _conn
+
+def cache_key(model: str, today: str, user_prompt: str) -> str:
+    """
+    Key on model + local date (relative phrases like "tomorrow" depend on it)
+    + normalized prompt.
+    """
+    raw = f"{model}\n{today}\n{user_prompt.strip().lower()}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+def scope_key(model: str, today: str) -> str:
+    """Semantic matches are only considered within the same model + local date."""
+    return hashlib.blake2b(f"{model}\n{today}".encode("utf-8"), digest_size=16).hexdigest()
+
+def signature(user_prompt: str) -> str:
+    """
+    Normalized numbers/times and day/month words of a prompt, order-free:
+    "Dentist Friday 2pm" and "friday 14:00 dentist" share one, 15:00 does not.
+    """
+    tokens = []
+    for m in _SIG_TOKEN_RE.finditer(user_prompt.lower()):
+        num, minutes, meridiem = m.groups()
+        if num is None:
+            word = m.group(0)
+            if word in _SIG_NUMBER_WORDS:
+                tokens.append(str(_SIG_NUMBER_WORDS[word]))
+            elif word in _SIG_WORDS:
+                tokens.append(word)
+            continue
+        value = int(num)
+        if meridiem:
+            value = value % 12 + (12 if meridiem[0] == "p" else 0)
+            tokens.append(f"{value}:{minutes or '00'}")
+        else:
+            tokens.append(f"{value}:{minutes}" if minutes else str(value))
+    return " ".join(sorted(tokens))
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    row = conn().execute(
+        "SELECT json FROM proposals WHERE key=? AND created_at >= ?",
+        (key, int(time.time()) - CACHE_TTL_SEC),
+    ).fetchone()
+    if not row:
+        return None
+    try:
+        return json.loads(row["json"])
+    except ValueError:
+        return None
+
+def put(key: str, data: Dict[str, Any]) -> None:
+    c = conn()
+    with c:
+        c.execute(
+            "INSERT INTO proposals (key, json, created_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET json=excluded.json, created_at=excluded.created_at",
+            (key, json.dumps(data), int(time.time())),
+        )
+
+def delete(key: str) -> None:
+    """Forget the proposal (and embedding) stored under `key`."""
+    c = conn()
+    with c:
+        c.execute("DELETE FROM proposals WHERE key=?", (key,))
+        c.execute("DELETE FROM vectors WHERE key=?", (key,))
+
+def put_vector(key: str, scope: str, sig: str, vec: Sequence[float]) -> None:
+    """Store the prompt embedding (and signature()) for a proposal already stored under `key`."""
+    packed = array.array("f", vec)
+    norm = math.sqrt(sum(map(operator.mul, packed, packed)))
+    if not norm:
+        return
+    c = conn()
+    with c:
+        c.execute(
+            "INSERT INTO vectors (key, scope, sig, vec, norm, created_at) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET scope=excluded.scope, sig=excluded.sig, vec=excluded.vec, "
+            "norm=excluded.norm, created_at=excluded.created_at",
+            (key, scope, sig, packed.tobytes(), norm, int(time.time())),
+        )
+
+def nearest(
+    scope: str, sig: str, vec: Sequence[float], threshold: float = SEMANTIC_THRESHOLD
+) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached proposal whose prompt embedding is most similar to `vec`
+    (cosine >= threshold) among prompts in `scope` with the same signature(), or None.
+    """
+    query = array.array("f", vec)
+    qnorm = math.sqrt(sum(map(operator.mul, query, query)))
+    if not qnorm:
+        return None
+    rows = conn().execute(
+        "SELECT key, vec, norm FROM vectors WHERE scope=? AND sig=? AND created_at >= ?",
+        (scope, sig, int(time.time()) - CACHE_TTL_SEC),
+    ).fetchall()
+    best_key: Optional[str] = None
+    best_sim = threshold
+    for row in rows:
+        stored = array.array("f")
+        stored.frombytes(row["vec"])
+        if len(stored) != len(query):
+            continue  # embedding model changed
+        sim = sum(map(operator.mul, stored, query)) / (row["norm"] * qnorm)
+        if sim >= best_sim:
+            best_key, best_sim = row["key"], sim
+    return get(best_key) if best_key else None
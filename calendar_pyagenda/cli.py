@@ -3,10 +3,6 @@ import argparse
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-from tkcalendar import DateEntry
-
 from . import db
 from .models import Event
 from .utils import parse_date_time, to_utc, now_utc
@@ -14,6 +10,11 @@ from .ics_import import import_ics
 
 def pick_datetime_gui() -> Optional[tuple[str, Optional[str]]]:
     # Returns (YYYY-MM-DD, HH:MM) or None if cancelled
+    # Tk is imported here so non-GUI commands don't pay for it at startup.
+    import tkinter as tk
+    from tkinter import ttk, messagebox
+    from tkcalendar import DateEntry
+
     root = tk.Tk()
     root.title("Select date and time")
     root.geometry("280x160")
@@ -116,12 +117,12 @@ def cmd_add(args: argparse.Namespace) -> None:
 def cmd_list(args: argparse.Namespace) -> None:
     now = now_utc()
     window_end = now + timedelta(days=args.days)
-    occs = db.occurrences_between(now, window_end)
-    if not occs:
-        print("No upcoming events.")
-        return
-    for o in occs:
+    found = False
+    for o in db.iter_occurrences_between(now, window_end):
+        found = True
         print(f"- [{o.event.id}] {o.display_title()} :: {o.display_time_range_local()}")
+    if not found:
+        print("No upcoming events.")
 
 def cmd_import(args: argparse.Namespace) -> None:
     count = import_ics(args.path)
@@ -1,13 +1,32 @@
 from __future__ import annotations
 import sqlite3
-from typing import List, Optional, Iterable, Tuple
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Iterable, Iterator, Set, Tuple
 from datetime import datetime, timezone, timedelta
 
 from . import config
-from .models import Event, Occurrence, expand_event
-from .utils import ensure_dirs, iso, parse_iso, loads_exdates, dumps_exdates, now_utc
+from .models import Event, Occurrence, merge_occurrences
+from .utils import ensure_dirs, iso, parse_iso, loads_exdates, now_utc
 
-_conn: Optional[sqlite3.Connection] = None
+# One connection per thread: sqlite3 connections must not be shared across
+# threads, and under WAL separate connections read concurrently with a writer.
+_local = threading.local()
+
+# SQL kept as module constants: built once, and identical strings hit the
+# connection's prepared-statement cache.
+_SQL_SET_NOTIFY = (
+    "INSERT INTO event_notify (event_id, notify) VALUES (?, ?) "
+    "ON CONFLICT(event_id) DO UPDATE SET notify=excluded.notify"
+)
+_SQL_INSERT_EXDATE = "INSERT OR IGNORE INTO exdates (event_id, dt_utc) VALUES (?, ?)"
+_SQL_NOTIFIED_SINCE = (
+    "SELECT event_id, occurrence_start, threshold FROM notifications WHERE occurrence_start >= ?"
+)
+_SQL_RECORD_NOTIFIED = (
+    "INSERT OR IGNORE INTO notifications (event_id, occurrence_start, threshold, notified_at) "
+    "VALUES (?, ?, ?, ?)"
+)
 
 # New notification preference constants/utilities
 ALLOWED_THRESHOLDS = ["month", "week", "day", "hour", "now"]
@@ -37,42 +56,109 @@ def normalize_notify_arg(value: str) -> str:
     ordered = [t for t in ALLOWED_THRESHOLDS if t in parts]
     return ",".join(ordered)
 
-def get_event_notify(event_id: int) -> str:
+# Stay well under SQLite's bound-parameter limit (999 on older builds) for IN (...) lists.
+_IN_CHUNK = 500
+
+def _chunks(values: List[int]) -> Iterator[List[int]]:
+    for i in range(0, len(values), _IN_CHUNK):
+        yield values[i:i + _IN_CHUNK]
+
+def get_events_notify(event_ids: Iterable[int]) -> Dict[int, str]:
     """
-    Returns the stored notify string or the default if none stored.
+    {event_id: notify} for every requested id, with the default filled in
+    where nothing is stored.
     """
+    ids = list(set(event_ids))
+    out = {ev_id: DEFAULT_NOTIFY for ev_id in ids}
     c = conn()
-    row = c.execute("SELECT notify FROM event_notify WHERE event_id=?", (event_id,)).fetchone()
-    if row and row["notify"]:
-        return row["notify"]
-    return DEFAULT_NOTIFY
+    for chunk in _chunks(ids):
+        rows = c.execute(
+            f"SELECT event_id, notify FROM event_notify WHERE event_id IN ({','.join('?' * len(chunk))})",
+            chunk,
+        ).fetchall()
+        for r in rows:
+            if r["notify"]:
+                out[r["event_id"]] = r["notify"]
+    return out
 
 def set_event_notify(event_id: int, notify: str) -> None:
     """
     Store/overwrite notify preference (canonical string or 'never').
     """
     c = conn()
-    with c:
-        c.execute(
-            "INSERT INTO event_notify (event_id, notify) VALUES (?, ?) "
-            "ON CONFLICT(event_id) DO UPDATE SET notify=excluded.notify",
-            (event_id, notify),
-        )
+    with _transaction(c):
+        c.execute(_SQL_SET_NOTIFY, (event_id, notify))
+
+def set_events_notify(prefs: Iterable[Tuple[int, str]]) -> None:
+    """
+    Bulk variant of set_event_notify: (event_id, notify) pairs in one transaction.
+    """
+    c = conn()
+    with _transaction(c):
+        c.executemany(_SQL_SET_NOTIFY, list(prefs))
 
 def _connect() -> sqlite3.Connection:
     ensure_dirs()
-    conn = sqlite3.connect(str(config.DB_PATH))
+    # isolation_level=None: autocommit, with explicit BEGIN/COMMIT in
+    # _transaction() instead of the module's implicit-transaction handling.
+    conn = sqlite3.connect(str(config.DB_PATH), cached_statements=256, isolation_level=None)
     conn.row_factory = sqlite3.Row
-    with conn:
-        conn.execute("PRAGMA foreign_keys = ON;")
+    # WAL: one fsync per commit (no rollback journal) and readers don't block
+    # the writer, which matters with the notifier daemon and GUI open together.
+    # PRAGMAs: journal_mode and foreign_keys must run outside a transaction.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")  # ~20 MB
+    conn.execute("PRAGMA mmap_size=268435456;")  # 256 MB
+    conn.execute("PRAGMA foreign_keys = ON;")
     return conn
 
+@contextmanager
+def _transaction(c: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """BEGIN ... COMMIT, rolling back on error. Not re-entrant."""
+    c.execute("BEGIN")
+    try:
+        yield c
+        c.execute("COMMIT")
+    except BaseException:
+        # A failed COMMIT leaves the transaction open on this (cached) connection;
+        # SQLite may also have rolled back already, in which case ROLLBACK would
+        # raise and mask the original error.
+        if c.in_transaction:
+            c.execute("ROLLBACK")
+        raise
+    finally:
+        # data_version does not move for this connection's own commits
+        _snapshots().clear()
+
+def _snapshots() -> Dict[str, Tuple[int, object]]:
+    snaps = getattr(_local, "snapshots", None)
+    if snaps is None:
+        snaps = _local.snapshots = {}
+    return snaps
+
+def _snapshot(c: sqlite3.Connection, name: str, load):
+    """
+    Return load()'s cached result while PRAGMA data_version is unchanged,
+    i.e. no other connection has committed since, and this one has not
+    written (_transaction clears the cache).
+    """
+    version = c.execute("PRAGMA data_version").fetchone()[0]
+    snaps = _snapshots()
+    hit = snaps.get(name)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    value = load()
+    snaps[name] = (version, value)
+    return value
+
 def conn() -> sqlite3.Connection:
-    global _conn
-    if _conn is None:
-        _conn = _connect()
-        init_db(_conn)
-    return _conn
+    c = getattr(_local, "conn", None)
+    if c is None:
+        c = _local.conn = _connect()
+        init_db(c)
+    return c
 
 def init_db(c: sqlite3.Connection) -> None:
     c.executescript(
@@ -104,10 +190,76 @@ def init_db(c: sqlite3.Connection) -> None:
             FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
         );
         -- notifier_day table removed (per-day global cap deprecated)
+        CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_utc);
+        -- Range lookups: one-off events by end time, recurring events as a small set
+        CREATE INDEX IF NOT EXISTS idx_events_nonrecurring ON events(end_utc, start_utc) WHERE rrule IS NULL;
+        CREATE INDEX IF NOT EXISTS idx_events_recurring ON events(start_utc) WHERE rrule IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_notifications_occurrence ON notifications(occurrence_start);
+        -- Excluded occurrence starts (replaces the legacy events.exdates JSON column)
+        CREATE TABLE IF NOT EXISTS exdates (
+            event_id INTEGER NOT NULL,
+            dt_utc TEXT NOT NULL,
+            PRIMARY KEY (event_id, dt_utc),
+            FOREIGN KEY (event_id) REFERENCES events(id) ON DELETE CASCADE
+        );
         """
     )
+    if c.execute("PRAGMA user_version").fetchone()[0] < 1:
+        _migrate_exdates_json(c)
+
+def _migrate_exdates_json(c: sqlite3.Connection) -> None:
+    # One-time move of events.exdates JSON into the exdates table (schema v1).
+    rows = c.execute("SELECT id, exdates FROM events WHERE exdates IS NOT NULL").fetchall()
+    with _transaction(c):
+        c.executemany(
+            _SQL_INSERT_EXDATE,
+            [(r["id"], iso(d)) for r in rows for d in loads_exdates(r["exdates"])],
+        )
+        c.execute("UPDATE events SET exdates=NULL WHERE exdates IS NOT NULL")
+        c.execute("PRAGMA user_version = 1")
+
+def _load_exdates(c: sqlite3.Connection, where: str = "", params: Tuple = ()) -> Dict[int, List[datetime]]:
+    """{event_id: [exdate, ...]} for exdates rows joined to events matching `where`."""
+    rows = _tuple_cursor(c).execute(
+        "SELECT x.event_id, x.dt_utc FROM exdates x JOIN events e ON e.id = x.event_id "
+        f"{where} ORDER BY x.event_id, x.dt_utc",
+        params,
+    ).fetchall()
+    out: Dict[int, List[datetime]] = {}
+    for event_id, dt_utc in rows:
+        out.setdefault(event_id, []).append(parse_iso(dt_utc))
+    return out
+
+def _write_exdates(c: sqlite3.Connection, event_id: int, exdates: Iterable[datetime]) -> None:
+    c.executemany(_SQL_INSERT_EXDATE, [(event_id, iso(d)) for d in exdates])
+
+def _tuple_cursor(c: sqlite3.Connection) -> sqlite3.Cursor:
+    # Plain tuple rows for bulk reads: positional unpacking instead of a
+    # sqlite3.Row key lookup per column. Ad-hoc queries keep Row.
+    cur = c.cursor()
+    cur.row_factory = None
+    return cur
+
+# Column order expected by _row_to_event_tuple.
+_EVENT_COLUMNS = "id, title, description, location, start_utc, end_utc, all_day, rrule, created_at, updated_at"
+
+def _row_to_event_tuple(t: tuple, exdates: Optional[List[datetime]] = None) -> Event:
+    ev_id, title, description, location, start_utc, end_utc, all_day, rrule, created_at, updated_at = t
+    return Event(
+        id=ev_id,
+        title=title,
+        description=description,
+        location=location,
+        start_utc=parse_iso(start_utc),
+        end_utc=parse_iso(end_utc),
+        all_day=bool(all_day),
+        rrule=rrule,
+        exdates=exdates or [],
+        created_at=parse_iso(created_at),
+        updated_at=parse_iso(updated_at),
+    )
 
-def _row_to_event(row: sqlite3.Row) -> Event:
+def _row_to_event(row: sqlite3.Row, exdates: Optional[List[datetime]] = None) -> Event:
     return Event(
         id=row["id"],
         title=row["title"],
@@ -117,42 +269,67 @@ def _row_to_event(row: sqlite3.Row) -> Event:
         end_utc=parse_iso(row["end_utc"]),
         all_day=bool(row["all_day"]),
         rrule=row["rrule"],
-        exdates=loads_exdates(row["exdates"]),
+        exdates=exdates or [],
         created_at=parse_iso(row["created_at"]),
         updated_at=parse_iso(row["updated_at"]),
     )
 
+_INSERT_EVENT_SQL = """
+    INSERT INTO events (title, description, location, start_utc, end_utc, all_day, rrule, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _event_insert_params(ev: Event, now: str) -> tuple:
+    return (
+        ev.title,
+        ev.description,
+        ev.location,
+        iso(ev.start_utc),
+        iso(ev.end_utc),
+        1 if ev.all_day else 0,
+        ev.rrule,
+        now,
+        now,
+    )
+
 def add_event(ev: Event) -> int:
     c = conn()
     now = iso(now_utc())
-    with c:
-        cur = c.execute(
-            """
-            INSERT INTO events (title, description, location, start_utc, end_utc, all_day, rrule, exdates, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                ev.title,
-                ev.description,
-                ev.location,
-                iso(ev.start_utc),
-                iso(ev.end_utc),
-                1 if ev.all_day else 0,
-                ev.rrule,
-                dumps_exdates(ev.exdates),
-                now,
-                now,
-            ),
+    with _transaction(c):
+        cur = c.execute(_INSERT_EVENT_SQL, _event_insert_params(ev, now))
+        new_id = int(cur.lastrowid)
+        _write_exdates(c, new_id, ev.exdates)
+    return new_id
+
+def add_events(events: Iterable[Event]) -> List[int]:
+    """
+    Insert many events with one executemany in a single transaction
+    (one commit instead of one per event). Returns the new ids in input order.
+    """
+    c = conn()
+    now = iso(now_utc())
+    events = list(events)
+    if not events:
+        return []
+    with _transaction(c):
+        c.executemany(_INSERT_EVENT_SQL, [_event_insert_params(ev, now) for ev in events])
+        last = c.execute("SELECT last_insert_rowid()").fetchone()[0]
+        # The write transaction holds the lock and `id` is a plain INTEGER PRIMARY KEY,
+        # so SQLite assigns max(id)+1 per row: the batch occupies a contiguous range.
+        ids = list(range(last - len(events) + 1, last + 1))
+        c.executemany(
+            _SQL_INSERT_EXDATE,
+            [(ev_id, iso(d)) for ev_id, ev in zip(ids, events) for d in ev.exdates],
         )
-        return int(cur.lastrowid)
+    return ids
 
 def update_event(ev: Event) -> None:
     assert ev.id is not None
     c = conn()
-    with c:
+    with _transaction(c):
         c.execute(
             """
-            UPDATE events SET title=?, description=?, location=?, start_utc=?, end_utc=?, all_day=?, rrule=?, exdates=?, updated_at=?
+            UPDATE events SET title=?, description=?, location=?, start_utc=?, end_utc=?, all_day=?, rrule=?, updated_at=?
             WHERE id=?
             """,
             (
@@ -163,50 +340,101 @@ def update_event(ev: Event) -> None:
                 iso(ev.end_utc),
                 1 if ev.all_day else 0,
                 ev.rrule,
-                dumps_exdates(ev.exdates),
                 iso(now_utc()),
                 ev.id,
             ),
         )
+        c.execute("DELETE FROM exdates WHERE event_id=?", (ev.id,))
+        _write_exdates(c, ev.id, ev.exdates)
 
 def delete_event(event_id: int) -> None:
     c = conn()
-    with c:
+    with _transaction(c):
         c.execute("DELETE FROM events WHERE id=?", (event_id,))
 
 def get_event(event_id: int) -> Optional[Event]:
     c = conn()
     row = c.execute("SELECT * FROM events WHERE id=?", (event_id,)).fetchone()
-    return _row_to_event(row) if row else None
+    if not row:
+        return None
+    return _row_to_event(row, _load_exdates(c, "WHERE e.id=?", (event_id,)).get(event_id))
+
+def _load_all_events(c: sqlite3.Connection) -> List[Event]:
+    rows = _tuple_cursor(c).execute(f"SELECT {_EVENT_COLUMNS} FROM events ORDER BY start_utc ASC").fetchall()
+    exdates = _load_exdates(c)
+    return [_row_to_event_tuple(t, exdates.get(t[0])) for t in rows]
 
 def list_events() -> List[Event]:
     c = conn()
-    rows = c.execute("SELECT * FROM events ORDER BY start_utc ASC").fetchall()
-    return [_row_to_event(r) for r in rows]
-
-def occurrences_between(start_utc: datetime, end_utc: datetime) -> List[Occurrence]:
-    out: List[Occurrence] = []
-    for ev in list_events():
-        out.extend(expand_event(ev, start_utc, end_utc))
-    out.sort(key=lambda o: o.start_utc)
-    return out
+    # Fresh list (callers may append/filter); the Event objects are shared.
+    return list(_snapshot(c, "all", lambda: _load_all_events(c)))
 
-# Notifier state
+# Columns needed to expand and display occurrences (notifier, GUI list, cal-cli list),
+# in the order _row_to_expansion_event unpacks them.
+_EXPANSION_COLUMNS = "id, title, location, start_utc, end_utc, all_day, rrule"
+
+def _row_to_expansion_event(t: tuple, exdates: Optional[List[datetime]] = None) -> Event:
+    # Partial Event: description/created_at/updated_at are not loaded.
+    # Use get_event() when the full record is needed (e.g. editing).
+    ev_id, title, location, start_utc, end_utc, all_day, rrule = t
+    return Event(
+        id=ev_id,
+        title=title,
+        description=None,
+        location=location,
+        start_utc=parse_iso(start_utc),
+        end_utc=parse_iso(end_utc),
+        all_day=bool(all_day),
+        rrule=rrule,
+        exdates=exdates or [],
+    )
 
-def has_notified(event_id: int, occurrence_start_iso: str, threshold: str) -> bool:
+def list_events_for_expansion(start_utc: datetime, end_utc: datetime) -> List[Event]:
+    """
+    Events that may have an occurrence in [start_utc, end_utc): every recurring
+    event, plus one-off events overlapping the window. Stored timestamps are
+    canonical UTC ISO strings, so string comparison matches time order.
+    Only _EXPANSION_COLUMNS are read. Unordered; callers sort occurrences
+    themselves (an ORDER BY here would steer SQLite onto idx_events_start
+    and away from the range index).
+    Recurring events do not depend on the window and are reused from a
+    data_version snapshot; only the one-off range query runs every call.
+    """
     c = conn()
-    row = c.execute(
-        "SELECT 1 FROM notifications WHERE event_id=? AND occurrence_start=? AND threshold=?",
-        (event_id, occurrence_start_iso, threshold),
-    ).fetchone()
-    return row is not None
+    one_off = _tuple_cursor(c).execute(
+        f"SELECT {_EXPANSION_COLUMNS} FROM events WHERE rrule IS NULL AND end_utc > ? AND start_utc < ?",
+        (iso(start_utc), iso(end_utc)),
+    ).fetchall()
+    return _snapshot(c, "recurring", lambda: _load_recurring(c)) + [_row_to_expansion_event(t) for t in one_off]
+
+def _load_recurring(c: sqlite3.Connection) -> List[Event]:
+    rows = _tuple_cursor(c).execute(f"SELECT {_EXPANSION_COLUMNS} FROM events WHERE rrule IS NOT NULL").fetchall()
+    # Exdates only matter for recurring events; one query for all of them.
+    exdates = _load_exdates(c, "WHERE e.rrule IS NOT NULL")
+    return [_row_to_expansion_event(t, exdates.get(t[0])) for t in rows]
 
-def record_notified(event_id: int, occurrence_start_iso: str, threshold: str) -> None:
+def iter_occurrences_between(start_utc: datetime, end_utc: datetime) -> Iterator[Occurrence]:
+    """Occurrences in the window, lazily and in start order."""
+    return merge_occurrences(list_events_for_expansion(start_utc, end_utc), start_utc, end_utc)
+
+# Notifier state
+
+def notified_keys(since_iso: str) -> Set[Tuple[int, str, str]]:
+    """
+    Every (event_id, occurrence_start, threshold) already sent for occurrences starting at or after since_iso, in one indexed query.
+    Past occurrences drop out, so the set stays as small as the upcoming window.
+    """
+    rows = _tuple_cursor(conn()).execute(_SQL_NOTIFIED_SINCE, (since_iso,)).fetchall()
+    return set(rows)
+
+def record_notified_many(keys: Iterable[Tuple[int, str, str]]) -> None:
+    """Record sent (event_id, occurrence_start, threshold) keys in one transaction."""
+    notified_at = iso(now_utc())
+    rows = [(ev_id, occ_start, th, notified_at) for ev_id, occ_start, th in keys]
+    if not rows:
+        return
     c = conn()
-    with c:
-        c.execute(
-            "INSERT OR IGNORE INTO notifications (event_id, occurrence_start, threshold, notified_at) VALUES (?, ?, ?, ?)",
-            (event_id, occurrence_start_iso, threshold, iso(now_utc())),
-        )
+    with _transaction(c):
+        c.executemany(_SQL_RECORD_NOTIFIED, rows)
 
 # Removed get_daily_count and inc_daily_count (no longer needed)
@@ -6,7 +6,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 
 from . import db
-from .models import Event, Occurrence
+from .models import Event, Occurrence, merge_occurrences
 from .utils import to_utc, to_local, dt_range_day_local, now_utc
 
 class EventDialog(tk.Toplevel):
@@ -127,7 +127,7 @@ class App(tk.Tk):
         # Left: month calendar
         self.cal = Calendar(left, selectmode="day")
         self.cal.pack(fill="both", expand=True, padx=8, pady=8)
-        self.cal.bind("<<CalendarSelected>>", lambda e: self.refresh_list())
+        self.cal.bind("<<CalendarSelected>>", lambda e: self.reload())
 
         # Right: event list and buttons
         top = ttk.Frame(right)
@@ -141,20 +141,33 @@ class App(tk.Tk):
         ttk.Button(btns, text="Add", command=self.on_add).pack(side="left", padx=4)
         ttk.Button(btns, text="Edit", command=self.on_edit).pack(side="left", padx=4)
         ttk.Button(btns, text="Delete", command=self.on_delete).pack(side="left", padx=4)
-        ttk.Button(btns, text="Refresh", command=self.refresh_list).pack(side="right", padx=4)
+        ttk.Button(btns, text="Refresh", command=self.reload).pack(side="right", padx=4)
 
         self.current_occurrences: list[Occurrence] = []
+        # All events, kept in sync by on_add/on_edit/on_delete without a re-read.
+        # Day selection and Refresh re-fetch so cal-cli/cal-ai writes show up;
+        # db.list_events() serves that from its data_version snapshot when unchanged.
+        self._events_cache: Optional[list[Event]] = None
         self.refresh_list()
 
     def selected_date_local(self) -> datetime:
         d = self.cal.selection_get()
         return datetime(d.year, d.month, d.day)
 
+    def events(self) -> list[Event]:
+        if self._events_cache is None:
+            self._events_cache = db.list_events()
+        return self._events_cache
+
+    def reload(self):
+        self._events_cache = None
+        self.refresh_list()
+
     def refresh_list(self):
         self.list.delete(0, "end")
         day_local = self.selected_date_local()
         start_utc, end_utc = dt_range_day_local(day_local)
-        self.current_occurrences = db.occurrences_between(start_utc, end_utc)
+        self.current_occurrences = list(merge_occurrences(self.events(), start_utc, end_utc))
         for o in self.current_occurrences:
             self.list.insert("end", f"[{o.event.id}] {o.display_time_range_local()} :: {o.display_title()}")
 
@@ -169,8 +182,8 @@ class App(tk.Tk):
         dlg = EventDialog(self)
         if dlg.result:
             ev = dlg.result
-            new_id = db.add_event(ev)
-            # reload
+            ev.id = db.add_event(ev)
+            self.events().append(ev)
             self.refresh_list()
 
     def on_edit(self):
@@ -188,6 +201,11 @@ class App(tk.Tk):
             # Preserve exdates
             edited.exdates = ev.exdates
             db.update_event(edited)
+            events = self.events()
+            for i, cached in enumerate(events):
+                if cached.id == edited.id:
+                    events[i] = edited
+                    break
             self.refresh_list()
 
     def on_delete(self):
@@ -197,6 +215,7 @@ class App(tk.Tk):
             return
         if messagebox.askyesno("Delete", f"Delete event [{occ.event.id}] '{occ.event.title}'?"):
             db.delete_event(occ.event.id)  # type: ignore[arg-type]
+            self._events_cache = [e for e in self.events() if e.id != occ.event.id]
             self.refresh_list()
 
 def main():
@@ -35,7 +35,7 @@ def _rrule_to_str(rrule_val) -> Optional[str]:
 def import_ics(path: str) -> int:
     with open(path, "rb") as f:
         cal = ICal.from_ical(f.read())
-    count = 0
+    events: List[Event] = []
     for comp in cal.walk():
         if comp.name != "VEVENT":
             continue
@@ -75,6 +75,7 @@ def import_ics(path: str) -> int:
             rrule=rrule_str,
             exdates=exdates,
         )
-        db.add_event(new)
-        count += 1
-    return count
+        events.append(new)
+    # Single transaction for the whole file
+    db.add_events(events)
+    return len(events)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
-from dateutil.rrule import rrulestr
+import heapq
+import re
+from functools import lru_cache
 
-from .utils import to_local
+from dateutil.rrule import rrulebase, rrulestr
+
+from .utils import to_local, iso, parse_iso
 
 @dataclass
 class Event:
@@ -45,21 +49,66 @@ class Occurrence:
             return f"{s.strftime('%Y-%m-%d %H:%M')} - {e.strftime('%H:%M')}"
         return f"{s.strftime('%Y-%m-%d %H:%M')} - {e.strftime('%Y-%m-%d %H:%M')}"
 
-def expand_event(event: Event, window_start_utc: datetime, window_end_utc: datetime) -> List[Occurrence]:
-    out: List[Occurrence] = []
+@lru_cache(maxsize=1024)
+def _compiled_rrule(rrule_str: str, dtstart_iso: str) -> rrulebase:
+    # Parsed rules are immutable for iteration; reuse them across expansions
+    # (the notifier re-expands the same events every cycle).
+    return rrulestr(rrule_str, dtstart=parse_iso(dtstart_iso))
+
+# FREQ=DAILY/WEEKLY with at most an INTERVAL: no COUNT/UNTIL/BY* parts, so the
+# occurrences are just dtstart + i*step (all in UTC) and dateutil can be skipped.
+_SIMPLE_RRULE_RE = re.compile(r"^FREQ=(DAILY|WEEKLY)(?:;INTERVAL=(\d+))?$")
+_SIMPLE_FREQ_DAYS = {"DAILY": 1, "WEEKLY": 7}
+
+def _simple_rrule_fastpath(rrule: str, dtstart: datetime, window_start_utc: datetime, window_end_utc: datetime) -> Optional[Iterator[datetime]]:
+    """
+    Occurrence starts in [window_start_utc, window_end_utc] (bounds inclusive,
+    as in the dateutil path) for a simple rule, or None to fall back to rrulestr.
+    """
+    m = _SIMPLE_RRULE_RE.match(rrule)
+    if not m:
+        return None
+    interval = int(m.group(2) or 1)
+    if interval < 1:
+        return None
+    step = timedelta(days=_SIMPLE_FREQ_DAYS[m.group(1)] * interval)
+    base = dtstart.replace(microsecond=0)  # as rrule does
+    first = 0 if window_start_utc <= base else -((base - window_start_utc) // step)
+
+    def gen() -> Iterator[datetime]:
+        dt = base + first * step
+        while dt <= window_end_utc:
+            yield dt
+            dt += step
+    return gen()
+
+def expand_event(event: Event, window_start_utc: datetime, window_end_utc: datetime) -> Iterator[Occurrence]:
+    """Yield the event's occurrences inside the window, in start order."""
     base_dt = event.start_utc
     duration = event.duration
-    exset = {d.replace(microsecond=0) for d in event.exdates}
     # Single occurrence falls within window?
     if not event.rrule:
         if event.end_utc > window_start_utc and base_dt < window_end_utc:
-            out.append(Occurrence(event, base_dt, base_dt + duration))
-        return out
+            yield Occurrence(event, base_dt, base_dt + duration)
+        return
     # Recurring
-    rule = rrulestr(event.rrule, dtstart=base_dt)
-    # between() includes boundaries if inc=True
-    for dt in rule.between(window_start_utc, window_end_utc, inc=True):
+    exset = {d.replace(microsecond=0) for d in event.exdates}
+    starts = _simple_rrule_fastpath(event.rrule, base_dt, window_start_utc, window_end_utc)
+    if starts is None:
+        rule = _compiled_rrule(event.rrule, iso(base_dt))
+        # Same bounds as between(..., inc=True), but generated lazily
+        starts = rule.xafter(window_start_utc, inc=True)
+    for dt in starts:
+        if dt > window_end_utc:
+            break
         if dt.replace(tzinfo=base_dt.tzinfo).replace(microsecond=0) in exset:
             continue
-        out.append(Occurrence(event, dt, dt + duration))
-    return out
+        yield Occurrence(event, dt, dt + duration)
+
+def merge_occurrences(events: Iterable[Event], window_start_utc: datetime, window_end_utc: datetime) -> Iterator[Occurrence]:
+    """
+    Occurrences of `events` in the window, lazily and in start order: each
+    event's expansion is already ordered, so a k-way merge replaces a full sort.
+    """
+    expansions = [expand_event(ev, window_start_utc, window_end_utc) for ev in events]
+    return heapq.merge(*expansions, key=lambda o: o.start_utc)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 import time
+from bisect import bisect_left
 from datetime import datetime, timedelta
 import logging
 
@@ -9,7 +10,15 @@ from tzlocal import get_localzone
 from . import config, db
 from .utils import now_utc, to_local, iso
 
-CHECK_INTERVAL_SEC = 300  # 5 minutes
+CHECK_INTERVAL_SEC = 300  # 5 minutes (upper bound between checks)
+NOW_WINDOW_SEC = 4 * 60
+# Configured thresholds sorted by size once, for bisection in pick_threshold_name.
+_SORTED_THRESHOLDS = sorted(config.THRESHOLDS, key=lambda x: x[1].total_seconds())
+_THRESHOLD_NAMES = [name for name, _ in _SORTED_THRESHOLDS]
+_THRESHOLD_SECS = [delta.total_seconds() for _, delta in _SORTED_THRESHOLDS]
+# Seconds-before-start at which an occurrence enters a new threshold window,
+# largest first. The daemon wakes at the next such boundary.
+_WAKE_BOUNDS = sorted([NOW_WINDOW_SEC] + [d.total_seconds() for _, d in config.THRESHOLDS], reverse=True)
 
 logger = logging.getLogger("calendar.notify")
 
@@ -26,73 +35,104 @@ def init_notify():
 
 def pick_threshold_name(seconds_to_event: float) -> str | None:
     # New ultra-short phase independent from configured thresholds.
-    if 0 <= seconds_to_event <= 4 * 60:
+    if 0 <= seconds_to_event <= NOW_WINDOW_SEC:
         return "now"
+    if seconds_to_event < 0:
+        return None
     # Choose the smallest threshold whose delta >= time_to_event
-    for name, delta in sorted(config.THRESHOLDS, key=lambda x: x[1]):
-        if 0 <= seconds_to_event <= delta.total_seconds():
-            return name
-    return None
+    i = bisect_left(_THRESHOLD_SECS, seconds_to_event)
+    return _THRESHOLD_NAMES[i] if i < len(_THRESHOLD_NAMES) else None
 
 def send_notification(summary: str, body: str):
     n = notify2.Notification(summary, body)
     n.set_urgency(notify2.URGENCY_NORMAL)
     n.show()
 
-def check_once():
+def _next_boundary(seconds_to_event: float) -> float | None:
+    """Seconds from now until the occurrence enters its next (smaller) threshold window."""
+    for bound in _WAKE_BOUNDS:
+        if bound < seconds_to_event:
+            return seconds_to_event - bound
+    return None
+
+def check_once() -> tuple[int, datetime | None]:
+    """
+    Send due notifications. Returns (number sent, time of the next threshold
+    boundary among the scanned occurrences or None).
+    """
     now = now_utc()
     horizon = now + timedelta(days=30)
-    occs = db.occurrences_between(now, horizon)
-    sent_this_run = 0
-    notify_cache: dict[int, str] = {}
-    for occ in occs:
-        time_to = (occ.start_utc - now).total_seconds()
-        th = pick_threshold_name(time_to)
-        if not th:
-            continue
-        # Fetch per-event notify preference (cached)
-        ev_id = occ.event.id or -1
-        if ev_id not in notify_cache:
-            notify_cache[ev_id] = db.get_event_notify(ev_id)
-        pref = notify_cache[ev_id]
-        if pref == "never":
-            continue
-        allowed = set(pref.split(","))
-        if th not in allowed:
-            continue
-        occ_start_iso = iso(occ.start_utc)
-        if db.has_notified(ev_id, occ_start_iso, th):
-            continue
-        # Build message
-        local_start = to_local(occ.start_utc)
-        when_str = {
-            "now": "now",
-            "hour": "in about an hour",
-            "day": "today",
-            "week": "within a week",
-            "month": "within a month",
-        }.get(th, "soon")
-        summary = f"Upcoming: {occ.event.title}"
-        body = f"{when_str}\n{local_start.strftime('%Y-%m-%d %H:%M')} — {occ.event.location or ''}".strip()
-        try:
-            send_notification(summary, body)
-            db.record_notified(ev_id, occ_start_iso, th)
-            sent_this_run += 1
-            logger.info("Notified: event_id=%s start=%s threshold=%s (prefs=%s)", ev_id, occ_start_iso, th, pref)
-        except Exception as e:
-            logger.exception("Notification failed: %s", e)
-    return sent_this_run
+    # First pass: occurrences inside some threshold window, and the next boundary
+    due = []
+    next_wake_sec: float | None = None
+    for occ in db.iter_occurrences_between(now, horizon):
+        seconds_to_event = (occ.start_utc - now).total_seconds()
+        th = pick_threshold_name(seconds_to_event)
+        if th:
+            # Sent-set key computed once here; to_local() only for what is actually sent
+            due.append((occ, th, iso(occ.start_utc)))
+        wait = _next_boundary(seconds_to_event)
+        if wait is not None and (next_wake_sec is None or wait < next_wake_sec):
+            next_wake_sec = wait
+    next_wake = now + timedelta(seconds=next_wake_sec) if next_wake_sec is not None else None
+    if not due:
+        return 0, next_wake
+    # Per-event prefs and already-sent keys in a couple of queries, not two per occurrence
+    ev_ids = {occ.event.id or -1 for occ, _, _ in due}
+    prefs = db.get_events_notify(ev_ids)
+    # Parsed once per event (None = "never"), not split per occurrence
+    notify_cache: dict[int, frozenset[str] | None] = {
+        ev_id: None if pref == "never" else frozenset(pref.split(","))
+        for ev_id, pref in prefs.items()
+    }
+    already_sent = db.notified_keys(iso(now))
+    sent_keys: list[tuple[int, str, str]] = []
+    try:
+        for occ, th, occ_start_iso in due:
+            ev_id = occ.event.id or -1
+            allowed = notify_cache[ev_id]
+            if allowed is None or th not in allowed:
+                continue
+            if (ev_id, occ_start_iso, th) in already_sent:
+                continue
+            # Build message
+            local_start = to_local(occ.start_utc)
+            when_str = {
+                "now": "now",
+                "hour": "in about an hour",
+                "day": "today",
+                "week": "within a week",
+                "month": "within a month",
+            }.get(th, "soon")
+            summary = f"Upcoming: {occ.event.title}"
+            body = f"{when_str}\n{local_start.strftime('%Y-%m-%d %H:%M')} — {occ.event.location or ''}".strip()
+            try:
+                send_notification(summary, body)
+                sent_keys.append((ev_id, occ_start_iso, th))
+                already_sent.add((ev_id, occ_start_iso, th))
+                logger.info("Notified: event_id=%s start=%s threshold=%s (prefs=%s)", ev_id, occ_start_iso, th, prefs[ev_id])
+            except Exception as e:
+                logger.exception("Notification failed: %s", e)
+    finally:
+        # Flush in one transaction (also if the loop is interrupted)
+        db.record_notified_many(sent_keys)
+    return len(sent_keys), next_wake
 
 def main():
     setup_logging()
     init_notify()
     logger.info("Notifier started")
     while True:
+        delay = CHECK_INTERVAL_SEC
         try:
-            check_once()
+            _, next_wake = check_once()
+            if next_wake is not None:
+                # Sleep until the next threshold boundary, but re-check at least
+                # every CHECK_INTERVAL_SEC (new events, clock changes).
+                delay = max(1, min(CHECK_INTERVAL_SEC, (next_wake - now_utc()).total_seconds()))
         except Exception as e:
             logger.exception("check_once failed: %s", e)
-        time.sleep(CHECK_INTERVAL_SEC)
+        time.sleep(delay)
 
 if __name__ == "__main__":
     main()
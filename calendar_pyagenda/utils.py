@@ -1,23 +1,32 @@
 from __future__ import annotations
 from datetime import datetime, timezone, timedelta
-from typing import Optional, Iterable
+from typing import Optional
 import json
 from pathlib import Path
 
-from tzlocal import get_localzone
+from tzlocal import get_localzone, reload_localzone
 
 from . import config
 
+_UTC = timezone.utc
+# Resolved once per process; to_local() runs per displayed/checked occurrence.
+_LOCAL_TZ = get_localzone()
+
+def _refresh_tz() -> None:
+    """Re-read the system timezone (e.g. after it changed, or in tests)."""
+    global _LOCAL_TZ
+    _LOCAL_TZ = reload_localzone()
+
 def ensure_dirs() -> None:
     config.DATA_DIR.mkdir(parents=True, exist_ok=True)
     config.CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 def now_utc() -> datetime:
-    return datetime.now(timezone.utc)
+    return datetime.now(_UTC)
 
 def _attach_local_tz(dt: datetime) -> datetime:
     """Attach system local tz to a naïve datetime (pytz/zoneinfo compatible)."""
-    tz = get_localzone()
+    tz = _LOCAL_TZ
     # pytz has .localize; zoneinfo does not.
     localize = getattr(tz, "localize", None)
     if callable(localize):
@@ -27,17 +36,20 @@ def _attach_local_tz(dt: datetime) -> datetime:
 def to_utc(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         dt = _attach_local_tz(dt)
-    return dt.astimezone(timezone.utc)
+    return dt.astimezone(_UTC)
 
 def to_local(dt_utc: datetime) -> datetime:
-    return dt_utc.astimezone(get_localzone())
+    return dt_utc.astimezone(_LOCAL_TZ)
 
 def iso(dt: datetime) -> str:
-    # ISO 8601 with timezone
-    return dt.astimezone(timezone.utc).isoformat()
+    # ISO 8601 with timezone (stored/expanded datetimes are already UTC)
+    if dt.tzinfo is _UTC:
+        return dt.isoformat()
+    return dt.astimezone(_UTC).isoformat()
 
-def parse_iso(s: str) -> datetime:
-    return datetime.fromisoformat(s)
+# Bound directly to the C parser (no wrapper frame): row decoding calls it for
+# every stored timestamp, and a fixed-width slice parser measured ~10x slower.
+parse_iso = datetime.fromisoformat
 
 def parse_date_time(date_str: str, time_str: Optional[str]) -> datetime:
     # date_str: YYYY-MM-DD, time_str: HH:MM or None (00:00)
@@ -54,10 +66,7 @@ def dt_range_day_local(day_local: datetime) -> tuple[datetime, datetime]:
     local_start_naive = datetime(day_local.year, day_local.month, day_local.day, 0, 0, 0)
     local_start = _attach_local_tz(local_start_naive)
     local_end = local_start + timedelta(days=1)
-    return local_start.astimezone(timezone.utc), local_end.astimezone(timezone.utc)
-
-def dumps_exdates(exdates: Iterable[datetime]) -> str:
-    return json.dumps([iso(d) for d in exdates])
+    return local_start.astimezone(_UTC), local_end.astimezone(_UTC)
 
 def loads_exdates(s: Optional[str]) -> list[datetime]:
     if not s: